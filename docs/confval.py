@@ -26,14 +26,16 @@ if TYPE_CHECKING:
 _match_confval_default_value = re.compile(r'([^ ]+)\s*=\s*(.*)')
 _match_confval_default_value = _match_confval_default_value.match
 
+_refnode_template = addnodes.pending_xref(
+    '',
+    refdomain='rst', reftype='role',
+    reftarget='confval', refexplicit=False
+)
+_refnode_template += nodes.Text('[cv]')
+
 def parse_value(env, sig, signode):
     # type: (BuildEnvironment, str, Node) -> str
-    refnode = addnodes.pending_xref(
-        '',
-        refdomain='rst', reftype='role',
-        reftarget='confval', refexplicit=False
-    )
-    refnode += nodes.Text('[cv]')
+    refnode = _refnode_template.deepcopy()
     env.get_domain('rst').process_field_xref(refnode)
     signode += refnode
     signode += addnodes.desc_sig_space()
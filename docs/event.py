@@ -29,21 +29,25 @@ if TYPE_CHECKING:
 
 _match_event_signature = re.compile(r'([^ ]+)\s*\((.*)\)')
 _match_event_signature = _match_event_signature.match
+_squash_whitespaces = re.compile(r'\s{2,}')
+_squash_whitespaces = _squash_whitespaces.sub
+
+_refnode_template = addnodes.pending_xref(
+    '',
+    refdomain='rst', reftype='role',
+    reftarget='event', refexplicit=False
+)
+_refnode_template += nodes.Text('[ev]')
 
 def parse_event(env, sig, signode):
     # type: (BuildEnvironment, str, Node) -> str
-    refnode = addnodes.pending_xref(
-        '',
-        refdomain='rst', reftype='role',
-        reftarget='event', refexplicit=False
-    )
-    refnode += nodes.Text('[ev]')
+    refnode = _refnode_template.deepcopy()
     env.get_domain('rst').process_field_xref(refnode)
     signode += refnode
     signode += addnodes.desc_sig_space()
     match = _match_event_signature(sig)
     if not match:
-        sig = re.sub(r'\s{2,}', '', sig)
+        sig = _squash_whitespaces('', sig)
         signode += addnodes.desc_name(sig, sig)
         return sig
 
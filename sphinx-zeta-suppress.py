@@ -7,66 +7,37 @@ __all__ = ()
 
 import abc
 import contextlib
+import copy
+import functools
 import importlib
-import inspect
+import importlib.machinery
+import importlib.util
 import logging
 import pkgutil
 import re
+import sys
 import warnings
-from itertools import filterfalse, tee
+from collections import defaultdict
+from collections.abc import Iterable
 from typing import TYPE_CHECKING, TypeVar
 
 from sphinx.errors import ExtensionError
 from sphinx.util.logging import NAMESPACE, SphinxLoggerAdapter, getLogger
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Generator, Iterable, Iterator
+    from collections.abc import Callable, Generator
     from types import ModuleType
-    from typing import Any, Literal, TypeGuard
+    from typing import Any, Literal
 
     from sphinx.application import Sphinx
     from sphinx.config import Config
     from sphinx.extension import Extension
 
-    T = TypeVar('T')
-
 #: Logging level type.
 Level = TypeVar('Level', int, str)
 
 logger = getLogger(__name__)
 
-def _notnone(value):
-    # type: (Any) -> bool
-    return value is not None
-
-def _is_sphinx_logger_adapter(value):
-    # type: (Any) -> TypeGuard[SphinxLoggerAdapter]
-    return isinstance(value, SphinxLoggerAdapter)
-
-def _is_pattern_like(obj):
-    # type: (Any) -> TypeGuard[str | re.Pattern]
-    return isinstance(obj, (str, re.Pattern))
-
-def _partition(predicate, iterable):
-    # type: (Callable[[T], bool], Iterable[T]) -> (Iterator[T], Iterator[T])
-    """Partition an iterable into two iterators according to *predicate*.
-
-    The result is `(no, yes)` of iterators such that *no* and *yes* iterate
-    over the values in *iterable* for which *predicate* is falsey and truthy
-    respectively.
-
-    Typical usage::
-
-        odd, even = partition(lambda x: x % 2 == 0, range(10))
-
-        assert list(odd) == [1, 3, 5, 7, 8]
-        assert list(even) == [0, 2, 4, 6, 8]
-    """
-
-    no, yes = tee(iterable)
-    no, yes = filterfalse(predicate, no), filter(predicate, yes)
-    return no, yes
-
 def _normalize_level(level):
     # type: (Level) -> int | None
     """Convert a logging level name or integer into a known logging level."""
@@ -82,13 +53,120 @@ def _normalize_level(level):
         raise TypeError(f'invalid logging level type for {level}')
 
 def _parse_levels(levels):
-    # type: (Level | list[Level] | tuple[Level, ...]) -> list[int]
+    # type: (Level | Iterable[Level]) -> list[int]
     """Convert one or more logging levels into a list of logging levels."""
-    if not isinstance(levels, (list, tuple)):
-        if not isinstance(levels, (int, str)):
-            raise TypeError('invalid logging level type')
-        levels = [levels]
-    return list(filter(_notnone, map(_normalize_level, levels)))
+    # strings are iterable and must be checked first
+    if isinstance(levels, (int, str)):
+        level = _normalize_level(levels)
+        return [] if level is None else [level]
+    # bytes-like objects would be parsed as a sequence of integers
+    if isinstance(levels, (bytes, bytearray, memoryview)):
+        raise TypeError('invalid logging level type')
+    if not isinstance(levels, Iterable):
+        raise TypeError('invalid logging level type')
+    return [lv for lv in map(_normalize_level, levels) if lv is not None]
+
+@functools.lru_cache(maxsize=256)
+def _compile_cached(pattern):
+    # type: (str) -> re.Pattern
+    return re.compile(pattern)
+
+def _compile(pattern):
+    # type: (str | re.Pattern) -> re.Pattern
+    """Compile a pattern, sharing the result with identical patterns.
+
+    Unlike the cache of the :mod:`re` module, this cache is not cleared
+    when patterns compiled by other extensions fill it up.
+    """
+
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    return _compile_cached(pattern)
+
+#: Inline flags that can be scoped to a single alternative.
+_SCOPED_FLAGS = (
+    (re.IGNORECASE, 'i'),
+    (re.MULTILINE, 'm'),
+    (re.DOTALL, 's'),
+    (re.VERBOSE, 'x'),
+)
+
+# Alternatives referring to their groups by index cannot be joined since
+# the indices are shifted in the combined pattern. False positives (e.g.,
+# an escaped backslash followed by a digit) only disable the optimization.
+_has_numbered_reference = re.compile(r'\\[1-9]|\(\?\(\d').search
+
+def _as_alternative(pattern):
+    # type: (re.Pattern) -> str
+    """Convert a compiled pattern into a self-contained alternative."""
+    flags = ''.join(c for flag, c in _SCOPED_FLAGS if pattern.flags & flag)
+    source = pattern.pattern
+    if pattern.flags & re.VERBOSE:
+        source += '\n'  # terminate a trailing comment, if any
+    return f'(?{flags}:{source})'
+
+def _is_joinable(pattern):
+    # type: (re.Pattern) -> bool
+    """Check whether *pattern* can be part of an alternation."""
+    if isinstance(pattern.pattern, bytes):
+        return False
+    if pattern.flags & (re.ASCII | re.LOCALE):
+        return False
+    # Global inline flags, e.g., '(?i)', would leak into other alternatives.
+    # The source is recompiled with its verbose flag (if any) since comments
+    # in verbose patterns may not be valid regular expressions on their own.
+    verbose = pattern.flags & re.VERBOSE
+    try:
+        inline_flags = re.compile(pattern.pattern, verbose).flags
+    except re.error:
+        return False  # let the pattern be searched on its own
+    if inline_flags & ~(re.UNICODE | verbose):
+        return False
+    return not _has_numbered_reference(pattern.pattern)
+
+def _combine_searches(patterns):
+    # type: (tuple[re.Pattern, ...]) -> tuple[Callable[[str], Any], ...]
+    """Combine *patterns* into as few search functions as possible.
+
+    Patterns are joined into a single alternation so that the regular
+    expression engine scans a message once instead of once per pattern.
+    If the patterns cannot be safely joined, e.g., if they use numbered
+    backreferences or share group names, one function per pattern is
+    returned instead.
+    """
+
+    if len(patterns) < 2:
+        return tuple(p.search for p in patterns)
+
+    if all(map(_is_joinable, patterns)):
+        try:
+            combined = _compile('|'.join(map(_as_alternative, patterns)))
+        except re.error:
+            pass
+        else:
+            return (combined.search,)
+
+    return tuple(p.search for p in patterns)
+
+_MESSAGE_ATTR_NAME = '_zeta_suppress_message'
+
+def _get_message(record):
+    # type: (logging.LogRecord) -> str
+    """Get the message of *record*, formatting it at most once.
+
+    The formatted message is cached on the record so that other filters
+    attached to the same logger do not need to format it again. Messages
+    without arguments are cheap to get and therefore not cached.
+    """
+
+    if not record.args:
+        return record.getMessage()
+
+    m = getattr(record, _MESSAGE_ATTR_NAME, None)
+    if m is None:
+        m = record.getMessage()
+        setattr(record, _MESSAGE_ATTR_NAME, m)
+    return m
 
 class SphinxSuppressFilter(logging.Filter, metaclass=abc.ABCMeta):
     def filter(self, record):
@@ -120,21 +198,28 @@ class SphinxSuppressLogger(SphinxSuppressFilter):
         :param name: The (real) logger name to suppress.
         :type name: str
         :param levels: Optional logging levels to suppress.
-        :type levels: bool | Level | list[Level] | tuple[Level, ...]
+        :type levels: bool | Level | collections.abc.Iterable[Level]
         """
 
-        super().__init__(name)
+        # do not use super() since the next class in the MRO
+        # of SphinxSuppressRecord is SphinxSuppressPatterns
+        logging.Filter.__init__(self, name)
         if isinstance(levels, bool):
-            levels = _ALL if levels else []
+            levels = _ALL if levels else frozenset()
         else:
-            levels = _parse_levels(levels)
+            levels = frozenset(_parse_levels(levels))
 
-        #: List of logging levels to suppress.
-        self.levels: list[int] = levels
+        #: Set of logging levels to suppress.
+        self.levels: frozenset[int] | _All = levels
+        # logging.Filter.filter() is inlined in suppressed()
+        self._dotprefix = name + '.'
 
     def suppressed(self, record):
-        should_log = logging.Filter.filter(self, record)
-        return not should_log or record.levelno in self.levels
+        n, levels = record.name, self.levels
+        return (
+            (n == self.name or n.startswith(self._dotprefix))
+            and (levels is _ALL or record.levelno in levels)
+        )
 
 class SphinxSuppressPatterns(SphinxSuppressFilter):
     r"""A filter suppressing matching messages."""
@@ -147,16 +232,19 @@ class SphinxSuppressPatterns(SphinxSuppressFilter):
         :type patterns: list[str | re.Pattern]
         """
 
-        super().__init__('')  # all loggers
-        #: Set of patterns to search.
-        self.patterns: set[re.Pattern] = set(map(re.compile, patterns))
+        logging.Filter.__init__(self, '')  # all loggers
+        #: Tuple of patterns to search.
+        self.patterns: tuple[re.Pattern, ...]
+        self.patterns = tuple(map(_compile, patterns))
+        # bound methods are cached to avoid creating them for each record
+        self._searches = _combine_searches(self.patterns)
 
     def suppressed(self, record):
-        if not self.patterns:
+        if not self._searches:
             return False
 
-        m = record.getMessage()
-        return any(p.search(m) for p in self.patterns)
+        m = _get_message(record)
+        return any(search(m) for search in self._searches)
 
 class SphinxSuppressRecord(SphinxSuppressLogger, SphinxSuppressPatterns):
     r"""A filter suppressing matching messages by logger's name pattern."""
@@ -173,39 +261,95 @@ class SphinxSuppressRecord(SphinxSuppressLogger, SphinxSuppressPatterns):
         :type patterns: list[str | re.Pattern]
         """
 
-        SphinxSuppressLogger.__init__(self, name, levels)
         SphinxSuppressPatterns.__init__(self, patterns)
+        SphinxSuppressLogger.__init__(self, name, levels)
 
     def suppressed(self, record):
-        return (
-            SphinxSuppressLogger.suppressed(self, record)
-            and SphinxSuppressPatterns.suppressed(self, record)
-        )
+        # check the logger first to avoid formatting the message if possible
+        if not SphinxSuppressLogger.suppressed(self, record):
+            return False
+        return SphinxSuppressPatterns.suppressed(self, record)
+
+class _SphinxSuppressGlobalPatterns(SphinxSuppressPatterns):
+    r"""A filter suppressing matching messages of unprotected loggers."""
+
+    def __init__(self, patterns=(), protected=()):
+        """
+        Construct a :class:`_SphinxSuppressGlobalPatterns`.
+
+        :param patterns: Optional logging messages (regex) to suppress.
+        :type patterns: list[str | re.Pattern]
+        :param protected: Optional (real) logger names to never suppress,
+                          including their children.
+        :type protected: collections.abc.Iterable[str]
+        """
+
+        super().__init__(patterns)
+        #: Set of logger names whose records (and the records of their
+        #: children) are never suppressed.
+        self.protected: frozenset[str] = frozenset(protected)
+
+    def suppressed(self, record):
+        # records of submodules of protected packages are also protected
+        protected = self.protected
+        if protected and any(
+            p in protected
+            for p in _dotted_prefixes(record.name, len(NAMESPACE) + 1)
+        ):
+            return False
+        return SphinxSuppressPatterns.suppressed(self, record)
+
+def _dotted_prefixes(name, start=0):
+    # type: (str, int) -> Generator[str, None, None]
+    """Yield the dotted prefixes of *name*, ending with *name* itself.
+
+    The search for the first dot starts at index *start*.
+    """
+
+    index = name.find('.', start)
+    while index != -1:
+        yield name[:index]
+        index = name.find('.', index + 1)
+    yield name
 
 class _FiltersAdapter:
     def __init__(self, config):
         format_name = lambda name: f'{NAMESPACE}.{name}'
 
-        filters_by_prefix = {}
+        filters_by_prefix = defaultdict(list)
         for name, levels in config.zeta_suppress_loggers.items():
             prefix = format_name(name)
             suppressor = SphinxSuppressLogger(prefix, levels)
-            filters_by_prefix.setdefault(prefix, []).append(suppressor)
-
-        suppress_records = config.zeta_suppress_records
-        groups, patterns = _partition(_is_pattern_like, suppress_records)
-        for group in groups:  # type: tuple[str, ...]
-            prefix = format_name(group[0])
-            suppressor = SphinxSuppressRecord(prefix, True, group[1:])
-            filters_by_prefix.setdefault(prefix, []).append(suppressor)
-
-        #: The filter to always add.
-        self._global_filter = SphinxSuppressPatterns(patterns)
+            filters_by_prefix[prefix].append(suppressor)
+
+        # groups for the same logger are merged into a single filter
+        patterns, patterns_by_prefix = [], defaultdict(list)
+        for item in config.zeta_suppress_records:
+            if isinstance(item, (str, re.Pattern)):
+                patterns.append(item)
+            else:  # (logger name, pattern, ...)
+                patterns_by_prefix[format_name(item[0])].extend(item[1:])
+        for prefix, group_patterns in patterns_by_prefix.items():
+            suppressor = SphinxSuppressRecord(prefix, True, group_patterns)
+            filters_by_prefix[prefix].append(suppressor)
+
+        #: The filter to add to the handlers of the Sphinx root logger.
+        self.global_filter = _SphinxSuppressGlobalPatterns(
+            patterns, map(format_name, config.zeta_suppress_protect)
+        )
         #: The lists of filters to add, indexed by logger's prefix.
         #:
         #: The prefix always starts with :data:`sphinx.util.logging.NAMESPACE`,
         #: followed by a dot.
-        self._filters_by_prefix = filters_by_prefix
+        self._filters_by_prefix = dict(filters_by_prefix)
+        #: The names of the modules to alter.
+        self._module_names = frozenset(self.get_module_names())
+        #: The names of the modules to alter and of their parent packages.
+        self._module_ancestors = frozenset(
+            ancestor
+            for module_name in self._module_names
+            for ancestor in _dotted_prefixes(module_name)
+        )
 
     def get_module_names(self):
         # type: () -> Generator[str, None, None]
@@ -219,6 +363,20 @@ class _FiltersAdapter:
         for logger_name in self._filters_by_prefix:
             yield logger_name[prefix_len:]
 
+    def is_relevant(self, module_name):
+        # type: (str) -> bool
+        """Check whether a module may declare loggers to alter.
+
+        A module is relevant if it is a module to alter, a submodule
+        thereof, or a package containing a module to alter.
+        """
+
+        if module_name in self._module_ancestors:
+            return True
+
+        module_names = self._module_names
+        return any(p in module_names for p in _dotted_prefixes(module_name))
+
     def get_filters(self, name):
         """Yield the filters to add for the given logger's name.
 
@@ -230,13 +388,17 @@ class _FiltersAdapter:
         .. note:: The caller is responsible for adding the filters once.
         """
 
-        for prefix, filters in self._filters_by_prefix.items():
-            if name.startswith(prefix):
-                yield from filters
-        yield self._global_filter
+        # Instead of checking every prefix, look up the dotted prefixes of
+        # *name*, i.e., 'sphinx.a', 'sphinx.a.b', ..., 'sphinx.a.b.c.d'.
+        filters_by_prefix = self._filters_by_prefix
+        for prefix in _dotted_prefixes(name, len(NAMESPACE) + 1):
+            yield from filters_by_prefix.get(prefix, ())
 
 _CACHE_ATTR_NAME = '_zeta_suppress_cache'
 
+_FILTERS_ATTR_NAME = '_zeta_suppress_adapter'
+_INSTALLED_ATTR_NAME = '_zeta_suppress_filters'
+
 def _mark_module(app, module_name):
     # type: (Sphinx, str) -> None
     """Mark a module name as being altered."""
@@ -253,15 +415,49 @@ def _skip_module(app, module_name):
 def _update_module(config, module, filters):
     # type: (Config, ModuleType, _FiltersAdapter) -> None
     """Update the module's loggers using the corresponding filters."""
-    adapters = inspect.getmembers(module, _is_sphinx_logger_adapter)
-    for _, adapter in adapters:
-        for f in filters.get_filters(adapter.logger.name):
-            # Since a logger may be imported from a non-marked module,
-            # we ensure that the filter is only added at most once.
-            if f not in adapter.logger.filters:
-                logger.debug('updating logger: %s', adapter.logger.name,
+    # inspect.getmembers() would sort the members and trigger lazy
+    # attributes (e.g., module-level __getattr__), so the namespace
+    # is scanned directly instead
+    module_dict = getattr(module, '__dict__', None)
+    if module_dict is None:
+        return
+
+    for adapter in list(module_dict.values()):
+        if not isinstance(adapter, SphinxLoggerAdapter):
+            continue
+
+        # Since a logger may be imported from a non-marked module,
+        # we ensure that the filter is only added at most once. The
+        # filters added so far are stored on the logger itself since
+        # checking the list of its filters is linear in their number.
+        target = adapter.logger
+        installed = vars(target).setdefault(_INSTALLED_ATTR_NAME, set())
+        for f in filters.get_filters(target.name):
+            if f not in installed:
+                logger.debug('updating logger: %s', target.name,
                              type='sphinx-zeta-suppress', once=True)
-                adapter.logger.addFilter(f)
+                target.addFilter(f)
+                installed.add(f)
+
+def _update_root_handlers(f):
+    # type: (SphinxSuppressFilter) -> None
+    """Add a filter to the handlers of the Sphinx root logger.
+
+    Filters attached to a logger are not applied to the records propagated
+    by its children, unlike the filters attached to the logger's handlers.
+    """
+
+    for handler in logging.getLogger(NAMESPACE).handlers:
+        if f not in handler.filters:
+            # the filter must be applied before Sphinx's filters
+            # since the latter count warnings or turn them into errors
+            handler.filters.insert(0, f)
+
+def _remove_root_handlers(f):
+    # type: (SphinxSuppressFilter) -> None
+    """Remove a filter from the handlers of the Sphinx root logger."""
+    for handler in logging.getLogger(NAMESPACE).handlers:
+        handler.removeFilter(f)
 
 @contextlib.contextmanager
 def _suppress_deprecation_warnings():
@@ -270,6 +466,23 @@ def _suppress_deprecation_warnings():
         warnings.simplefilter('ignore', PendingDeprecationWarning)
         yield
 
+def _is_importable_source(module_name):
+    # type: (str) -> bool
+    """Check whether a module is implemented in Python without importing it.
+
+    Modules that are already imported are always considered importable.
+    Compiled extension modules are assumed not to declare Sphinx loggers.
+    Errors raised while looking for the module are propagated.
+    """
+
+    if module_name in sys.modules:
+        return True
+
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or spec.loader is None or not spec.has_location:
+        return False
+    return not isinstance(spec.loader, importlib.machinery.ExtensionFileLoader)
+
 def _setup_filters(app, module, filters):
     """Alter the Sphinx loggers accessible in *module* and its submodules.
 
@@ -292,27 +505,66 @@ def _setup_filters(app, module, filters):
     if not hasattr(module, '__path__'):
         return
 
-    # scan the submodules
+    # Scan the submodules. Unlike pkgutil.walk_packages(), which imports
+    # every subpackage to recurse into it, only relevant subpackages are
+    # imported and scanned recursively.
     mod_path, mod_prefix = module.__path__, module.__name__ + '.'
     with _suppress_deprecation_warnings():
-        for mod_info in pkgutil.walk_packages(mod_path, mod_prefix):
+        for mod_info in pkgutil.iter_modules(mod_path, mod_prefix):
+            if not filters.is_relevant(mod_info.name):
+                continue
+
             if _skip_module(app, mod_info.name):
                 logger.debug('skipping module: %s', mod_info.name,
                              type='sphinx-zeta-suppress', once=True)
                 continue
 
+            # Subpackages are imported here rather than by pkgutil, so that
+            # their import is screened and its errors reported as warnings.
             try:
+                if not _is_importable_source(mod_info.name):
+                    logger.debug('skipping compiled module: %s',
+                                 mod_info.name, type='sphinx-zeta-suppress',
+                                 once=True)
+                    continue
+
                 submodule = importlib.import_module(mod_info.name)
-            except ImportError as err:
+            except Exception as err:
                 logger.warning('cannot import module: %s', mod_info.name,
                                exc_info=err, type='sphinx-zeta-suppress')
                 continue
 
-            _mark_module(app, mod_info.name)
-            _update_module(app, submodule, filters)
+            _setup_filters(app, submodule, filters)
 
 # event handlers
 
+def _get_config_values(config):
+    # type: (Config) -> tuple[Any, ...]
+    """Get a copy of the configuration values used by the filters."""
+    return copy.deepcopy((
+        config.zeta_suppress_loggers,
+        config.zeta_suppress_protect,
+        config.zeta_suppress_records,
+    ))
+
+def _get_filters(app, config):
+    # type: (Sphinx, Config) -> _FiltersAdapter
+    """Get the filters configuration adapter for the current configuration.
+
+    The adapter is shared by both calls of :func:`install_supress_handlers`
+    so that the filters are created once, unless other :event:`config-inited`
+    handlers changed the configuration values in between.
+    """
+
+    filters, values = getattr(app, _FILTERS_ATTR_NAME, (None, None))
+    current_values = _get_config_values(config)
+    if filters is None or values != current_values:
+        if filters is not None:
+            _remove_root_handlers(filters.global_filter)
+        filters = _FiltersAdapter(config)
+        setattr(app, _FILTERS_ATTR_NAME, (filters, current_values))
+    return filters
+
 def install_supress_handlers(app, config):
     # type: (Sphinx, Config) -> None
     """Event handler for :event:`config-inited`.
@@ -321,14 +573,28 @@ def install_supress_handlers(app, config):
     for :event:`config-inited` so that loggers emitting messages during the
     initialization or loggers declared after :event:`config-inited` is fired
     can be altered properly.
+
+    The second call only scans the extensions that were loaded by other
+    :event:`config-inited` handlers, i.e., after the first call.
     """
 
-    filters = _FiltersAdapter(config)
+    if not config.zeta_suppress_loggers and not config.zeta_suppress_records:
+        return  # nothing to suppress
+
+    filters = _get_filters(app, config)
+    if filters.global_filter.patterns:
+        _update_root_handlers(filters.global_filter)
 
     # scan the loaded extensions and alter them
+    altered = getattr(app, _CACHE_ATTR_NAME)
     for extension in app.extensions.values():  # type: Extension
         module = extension.module
-        _setup_filters(app, module, filters)
+        if module.__name__ in altered:
+            continue  # already scanned by the first call
+
+        # do not import the submodules of unrelated extensions
+        if filters.is_relevant(module.__name__):
+            _setup_filters(app, module, filters)
 
     # scan modules and alter them directly
     with _suppress_deprecation_warnings():
@@ -350,9 +616,11 @@ def _create_temporary_cache(app, config):
 
 def _delete_temporary_cache(app, config):
     # type: (Sphinx, Config) -> None
-    """Delete the temporary attribute holding the altered modules."""
+    """Delete the temporary attributes holding the modules and filters."""
     if hasattr(app, _CACHE_ATTR_NAME):
         delattr(app, _CACHE_ATTR_NAME)
+    if hasattr(app, _FILTERS_ATTR_NAME):
+        delattr(app, _FILTERS_ATTR_NAME)
 
 def setup(app):
     # type: (Sphinx) -> dict